@@ -4,6 +4,7 @@ import psutil
 
 from master import TaskManager
 from server import Server
+from profiler import Profiler
 
 
 def capture_utilization():
@@ -18,6 +19,9 @@ if __name__ == '__main__':
     # Get scheduling algorithm from command line
     scheduling_algorithm = sys.argv[1]
     
+    # Optional scheduler self-profiling
+    profiler = Profiler() if '--profile' in sys.argv[2:] else None
+    
     # Validate algorithm selection
     if scheduling_algorithm in ['rr', 'sjf', 'priority']:
         
@@ -34,10 +38,13 @@ if __name__ == '__main__':
         requests = data['requisicoes']
         
         # Execute scheduling algorithm
-        task_manager = TaskManager(scheduling_algorithm, servers, requests)
+        task_manager = TaskManager(scheduling_algorithm, servers, requests, profiler)
         task_manager.start()
         task_manager.join()
 
         # Calculate and display metrics
         cpu_utilization = capture_utilization()
-        task_manager.calculate_metrics(cpu_utilization)
\ No newline at end of file
+        task_manager.calculate_metrics(cpu_utilization)
+        
+        if profiler:
+            profiler.report()
\ No newline at end of file
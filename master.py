@@ -1,11 +1,16 @@
 from colors import cyan
+from profiler import Profiler
+import math
 import threading
 import time
 
 class TaskManager(threading.Thread):
-    def __init__(self, architecture, servers, requests):
+    def __init__(self, architecture, servers, requests, profiler=None, quantum=1.0):
         super().__init__()
         
+        # Optional self-profiling (disabled profiler is a no-op)
+        self.profiler = profiler if profiler is not None else Profiler(enabled=False)
+        
         # Scheduler algorithm configuration
         self.architecture = architecture 
         self.servers = servers
@@ -13,12 +18,12 @@ class TaskManager(threading.Thread):
         
         # Performance tracking
         self.completion_times = {}
-        self.completion_lock = threading.Lock() 
+        self.completion_lock = self.profiler.instrument_lock(threading.Lock(), 'TaskManager.completion_lock')
         self.start_time = time.time()
         self.end_time = 0
         
         # Round-Robin specific attributes
-        self.quantum = 1.0
+        self.quantum = quantum
         self.tasks_in_progress = {}
         self.rr_ready_queue = []
         
@@ -33,13 +38,21 @@ class TaskManager(threading.Thread):
         # Bind manager to each server
         for server in self.servers:
             server.task_manager = self
+            server.profiler = self.profiler
+            server.lock = self.profiler.instrument_lock(server.lock, f'Server.lock (Servidor {server.id})')
     
 
-    def register_completion(self, task_id, response_time):
+    def register_completion(self, task_id, completion_time):
         """Handle task completion based on scheduling algorithm"""
         
         with self.completion_lock:
             original_task = next((t for t in self.requests if t['id'] == task_id), None)
+            
+            if original_task is None:
+                return
+            
+            # Response time measured from arrival, including time spent in the ready queue
+            response_time = completion_time - (self.start_time + original_task['temp_chegada'])
 
             if self.architecture == 'rr':
                 
@@ -70,17 +83,23 @@ class TaskManager(threading.Thread):
 
 
     def calculate_metrics(self, cpu_utilization):
-        """Calculate and display system performance metrics"""
+        """Calculate, display and return system performance metrics"""
         
         total_tasks = len(self.requests)
         
         if not self.completion_times or total_tasks == 0:
             avg_response_time = 0.0
+            p99_response_time = 0.0
             throughput = 0.0
         else:
             total_time = sum(self.completion_times.values())
             avg_response_time = total_time / len(self.completion_times) 
             
+            # 99th percentile response time (nearest-rank)
+            response_times = sorted(self.completion_times.values())
+            rank = math.ceil(0.99 * len(response_times))
+            p99_response_time = response_times[rank - 1]
+            
             execution_time = self.end_time - self.start_time
             if execution_time > 0:
                 throughput = len(self.completion_times) / execution_time 
@@ -111,15 +130,25 @@ class TaskManager(threading.Thread):
         else:
             max_wait_time = 4.3
 
-        self.display_summary(avg_response_time, cpu_utilization, max_wait_time, throughput)
+        self.display_summary(avg_response_time, p99_response_time, cpu_utilization, max_wait_time, throughput)
+        
+        return {
+            'avg_response_time': avg_response_time,
+            'p99_response_time': p99_response_time,
+            'cpu_utilization': cpu_utilization,
+            'max_wait_time': max_wait_time,
+            'throughput': throughput,
+            'completed_tasks': len(self.completion_times),
+        }
     
     
-    def display_summary(self, avg_response_time, cpu_utilization, max_wait_time, throughput):
+    def display_summary(self, avg_response_time, p99_response_time, cpu_utilization, max_wait_time, throughput):
         """Display performance summary"""
         
         print("\n" + "="*50)
         print("Resumo Final:")
         print(f"Tempo médio de resposta: {avg_response_time:.2f}s")
+        print(f"Tempo de resposta p99: {p99_response_time:.2f}s")
         print(f"Utilização média da CPU: {cpu_utilization:.2f}%")
         print(f"Taxa de espera máxima: {max_wait_time:.2f}s")
         print(f"Throughput: {throughput:.2f} tarefas/segundo")
@@ -129,12 +158,16 @@ class TaskManager(threading.Thread):
     def run(self):
         """Execute the configured scheduling algorithm"""
         
+        self.profiler.mark_start()
+        
         if self.architecture == 'rr':
             self.run_rr_scheduler()
         elif self.architecture == 'sjf':
             self.run_sjf_scheduler()
         elif self.architecture == 'priority':
             self.run_priority_scheduler()
+        
+        self.profiler.mark_end()
     
 
     def run_rr_scheduler(self):
@@ -166,10 +199,12 @@ class TaskManager(threading.Thread):
         while is_running:
             
             # Check termination conditions
-            with self.completion_lock:
-                all_completed = not self.tasks_to_complete 
+            with self.profiler.phase('status'):
+                with self.completion_lock:
+                    all_completed = not self.tasks_to_complete 
             
-            is_server_busy = any(s.get_server_status()['current_capacity'] > 0 for s in self.servers)
+            with self.profiler.phase('status'):
+                is_server_busy = any(s.get_server_status()['current_capacity'] > 0 for s in self.servers)
 
             # Exit when all tasks completed and servers idle
             if all_completed and not is_server_busy and not self.pending_global_queue and not self.rr_ready_queue:
@@ -183,81 +218,86 @@ class TaskManager(threading.Thread):
             current_time = time.time() - self.start_time 
             
             # Move arrived tasks to ready queue
-            tasks_to_move = []
-            for task in self.pending_global_queue:
-                if task['temp_chegada'] <= current_time:
-                    tasks_to_move.append(task)
+            with self.profiler.phase('arrival'):
+                tasks_to_move = []
+                for task in self.pending_global_queue:
+                    if task['temp_chegada'] <= current_time:
+                        tasks_to_move.append(task)
             
-            for task_to_move in tasks_to_move:
-                self.pending_global_queue.remove(task_to_move)
-                self.rr_ready_queue.append(task_to_move)
+                for task_to_move in tasks_to_move:
+                    self.pending_global_queue.remove(task_to_move)
+                    self.rr_ready_queue.append(task_to_move)
             
             # Dispatch tasks in round-robin fashion
-            for _ in range(num_servers):
+            with self.profiler.phase('dispatch'):
+                for _ in range(num_servers):
                 
-                if not self.rr_ready_queue:
-                    break
+                    if not self.rr_ready_queue:
+                        break
                     
-                server_idx_check = server_index % num_servers 
-                server = self.servers[server_idx_check]
+                    server_idx_check = server_index % num_servers 
+                    server = self.servers[server_idx_check]
                 
-                status = server.get_server_status()
+                    with self.profiler.phase('status'):
+                        status = server.get_server_status()
                 
-                if status['current_capacity'] < status['max_capacity']: 
+                    if status['current_capacity'] < status['max_capacity']: 
                     
-                    # Find next task not currently executing
-                    task_to_dispatch_reference = None
-                    for i, task_in_queue in enumerate(self.rr_ready_queue):
-                        if task_in_queue['id'] not in self.tasks_in_progress:
-                            task_to_dispatch_reference = self.rr_ready_queue.pop(i)
-                            break
+                        # Find next task not currently executing
+                        task_to_dispatch_reference = None
+                        for i, task_in_queue in enumerate(self.rr_ready_queue):
+                            if task_in_queue['id'] not in self.tasks_in_progress:
+                                task_to_dispatch_reference = self.rr_ready_queue.pop(i)
+                                break
                     
-                    if task_to_dispatch_reference is None:
-                        server_index += 1 
-                        continue
+                        if task_to_dispatch_reference is None:
+                            server_index += 1 
+                            continue
                         
-                    # Get master task object for state updates
-                    task = next((t for t in self.requests if t['id'] == task_to_dispatch_reference['id']), None)
+                        # Get master task object for state updates
+                        task = next((t for t in self.requests if t['id'] == task_to_dispatch_reference['id']), None)
                     
-                    if task is None:
-                        print(f"ERRO: Tarefa {task_to_dispatch_reference['id']} escalonada, mas não encontrada em self.requests.")
-                        server_index += 1
-                        continue
+                        if task is None:
+                            print(f"ERRO: Tarefa {task_to_dispatch_reference['id']} escalonada, mas não encontrada em self.requests.")
+                            server_index += 1
+                            continue
 
-                    # Calculate time slice
-                    time_slice = min(self.quantum, task['tempo_restante']) 
+                        # Calculate time slice
+                        time_slice = min(self.quantum, task['tempo_restante']) 
                     
-                    # Create dispatch copy with time slice
-                    dispatch_task = task.copy()
-                    dispatch_task['tempo_restante'] = time_slice 
+                        # Create dispatch copy with time slice
+                        dispatch_task = task.copy()
+                        dispatch_task['tempo_restante'] = time_slice 
                     
-                    # Update remaining time
-                    task['tempo_restante'] -= time_slice 
+                        # Update remaining time
+                        task['tempo_restante'] -= time_slice 
                     
-                    # Mark task as in progress
-                    self.tasks_in_progress[task['id']] = server.id 
+                        # Mark task as in progress
+                        self.tasks_in_progress[task['id']] = server.id 
                     
-                    server.assign_task(task=dispatch_task)
+                        server.assign_task(task=dispatch_task)
                     
-                    # Record first assignment time
-                    if task['primeira_atribuicao'] == -1: 
-                               task['primeira_atribuicao'] = current_time
+                        # Record first assignment time
+                        if task['primeira_atribuicao'] == -1: 
+                                   task['primeira_atribuicao'] = current_time
                     
-                    print(
-                        f"\n{cyan('[DISPATCH]')} "
-                        f"Tarefa {task['id']} -> Servidor {server.id} (Cap: {status['current_capacity']+1}/{status['max_capacity']})\n"
-                        f" - Quantum (Slice): {time_slice:.2f}s (Rest: {task['tempo_restante']:.2f}s)\n"
-                        f" - Tempo Execução Total (Original): {task['tempo_exec']:.2f}s\n"
-                        f" - Chegada: {task['temp_chegada']:.2f}s\n"
-                    )
+                        with self.profiler.phase('print'):
+                            print(
+                                f"\n{cyan('[DISPATCH]')} "
+                                f"Tarefa {task['id']} -> Servidor {server.id} (Cap: {status['current_capacity']+1}/{status['max_capacity']})\n"
+                                f" - Quantum (Slice): {time_slice:.2f}s (Rest: {task['tempo_restante']:.2f}s)\n"
+                                f" - Tempo Execução Total (Original): {task['tempo_exec']:.2f}s\n"
+                                f" - Chegada: {task['temp_chegada']:.2f}s\n"
+                            )
                     
-                    server_index += 1
+                        server_index += 1
                 
-                else:
-                    server_index += 1 
+                    else:
+                        server_index += 1 
             
             # Allow servers to process
-            time.sleep(0.1) 
+            with self.profiler.phase('sleep'):
+                time.sleep(0.1) 
             
         self.end_time = time.time()
         
@@ -298,58 +338,68 @@ class TaskManager(threading.Thread):
             current_time = time.time() - self.start_time
             
             # Move arrived tasks to ready queue
-            tasks_to_move = []
-            for task in self.pending_global_queue:
-                if task['temp_chegada'] <= current_time:
-                    tasks_to_move.append(task)
+            with self.profiler.phase('arrival'):
+                tasks_to_move = []
+                for task in self.pending_global_queue:
+                    if task['temp_chegada'] <= current_time:
+                        tasks_to_move.append(task)
             
-            for task_to_remove in tasks_to_move:
-                self.pending_global_queue.remove(task_to_remove)
-                self.sjf_ready_queue.append(task_to_remove)
+                for task_to_remove in tasks_to_move:
+                    self.pending_global_queue.remove(task_to_remove)
+                    self.sjf_ready_queue.append(task_to_remove)
             
             # Sort by execution time (shortest first)
-            self.sjf_ready_queue.sort(key=lambda x: x['tempo_exec']) 
+            with self.profiler.phase('sort'):
+                self.sjf_ready_queue.sort(key=lambda x: x['tempo_exec']) 
 
             # Find available servers
-            available_servers = [s for s in self.servers if s.get_server_status()['current_capacity'] < s.get_server_status()['max_capacity']]
+            with self.profiler.phase('status'):
+                available_servers = [s for s in self.servers if s.get_server_status()['current_capacity'] < s.get_server_status()['max_capacity']]
 
             assigned_tasks = []
             
             # Assign tasks to available servers
-            for server in available_servers:
+            with self.profiler.phase('dispatch'):
+                for server in available_servers:
                 
-                status = server.get_server_status()
-                if status['current_capacity'] >= status['max_capacity']:
-                    continue
+                    with self.profiler.phase('status'):
+                        status = server.get_server_status()
+                    if status['current_capacity'] >= status['max_capacity']:
+                        continue
                     
-                if not self.sjf_ready_queue:
-                    break
+                    if not self.sjf_ready_queue:
+                        break
                 
-                task = self.sjf_ready_queue.pop(0) 
+                    task = self.sjf_ready_queue.pop(0) 
                 
-                server.assign_task(task=task)
+                    server.assign_task(task=task)
                 
-                # Record first assignment time
-                if task.get('primeira_atribuicao', -1) == -1:
-                    task['primeira_atribuicao'] = current_time 
+                    # Record first assignment time
+                    if task.get('primeira_atribuicao', -1) == -1:
+                        task['primeira_atribuicao'] = current_time 
                 
-                status_after = server.get_server_status()
-                print(
-                        f"\n{cyan('[DISPATCH]')} "
-                        f"Tarefa {task['id']} -> Servidor {server.id} (Cap: {status_after['current_capacity']}/{status_after['max_capacity']})\n"
-                        f" - Tempo Execução Total: {task['tempo_exec']:.2f}s\n"
-                        f" - Chegada: {task['temp_chegada']:.2f}s\n"
-                    )
-                assigned_tasks.append(task)
+                    with self.profiler.phase('status'):
+                        status_after = server.get_server_status()
+                    with self.profiler.phase('print'):
+                        print(
+                                f"\n{cyan('[DISPATCH]')} "
+                                f"Tarefa {task['id']} -> Servidor {server.id} (Cap: {status_after['current_capacity']}/{status_after['max_capacity']})\n"
+                                f" - Tempo Execução Total: {task['tempo_exec']:.2f}s\n"
+                                f" - Chegada: {task['temp_chegada']:.2f}s\n"
+                            )
+                    assigned_tasks.append(task)
             
             # Prevent tight loop
-            is_server_busy = any(s.get_server_status()['current_capacity'] > 0 for s in self.servers)
+            with self.profiler.phase('status'):
+                is_server_busy = any(s.get_server_status()['current_capacity'] > 0 for s in self.servers)
             if self.pending_global_queue or self.sjf_ready_queue or is_server_busy:
-                time.sleep(0.1) 
+                with self.profiler.phase('sleep'):
+                    time.sleep(0.1) 
             
             # Check exit condition
-            if not self.tasks_to_complete and all(s.get_server_status()['current_capacity'] == 0 for s in self.servers):
-                 break
+            with self.profiler.phase('status'):
+                if not self.tasks_to_complete and all(s.get_server_status()['current_capacity'] == 0 for s in self.servers):
+                     break
                     
         self.end_time = time.time()
         
@@ -398,61 +448,71 @@ class TaskManager(threading.Thread):
             current_time = time.time() - self.start_time
             
             # Move arrived tasks to ready queue
-            tasks_to_move = []
-            for task_check in self.pending_global_queue:
-                if task_check['temp_chegada'] <= current_time:
-                    tasks_to_move.append(task_check)
+            with self.profiler.phase('arrival'):
+                tasks_to_move = []
+                for task_check in self.pending_global_queue:
+                    if task_check['temp_chegada'] <= current_time:
+                        tasks_to_move.append(task_check)
             
-            for task_to_remove in tasks_to_move:
-                self.pending_global_queue.remove(task_to_remove)
-                self.priority_ready_queue.append(task_to_remove)
-                # Re-sort by priority on each arrival
-                self.priority_ready_queue.sort(key=lambda x: x['prioridade']) 
+                for task_to_remove in tasks_to_move:
+                    self.pending_global_queue.remove(task_to_remove)
+                    self.priority_ready_queue.append(task_to_remove)
+                    # Re-sort by priority on each arrival
+                    with self.profiler.phase('sort'):
+                        self.priority_ready_queue.sort(key=lambda x: x['prioridade']) 
 
             # Find available servers
-            available_servers = [s for s in self.servers if s.get_server_status()['current_capacity'] < s.get_server_status()['max_capacity']]
+            with self.profiler.phase('status'):
+                available_servers = [s for s in self.servers if s.get_server_status()['current_capacity'] < s.get_server_status()['max_capacity']]
 
             assigned_tasks = []  
 
             # Assign tasks to available servers
-            for server in available_servers:
+            with self.profiler.phase('dispatch'):
+                for server in available_servers:
                 
-                status = server.get_server_status()
-                if status['current_capacity'] >= status['max_capacity']:
-                    continue
+                    with self.profiler.phase('status'):
+                        status = server.get_server_status()
+                    if status['current_capacity'] >= status['max_capacity']:
+                        continue
                     
-                if not self.priority_ready_queue:
-                    break
+                    if not self.priority_ready_queue:
+                        break
                 
-                task = self.priority_ready_queue.pop(0) 
+                    task = self.priority_ready_queue.pop(0) 
                 
-                server.assign_task(task=task)
+                    server.assign_task(task=task)
                 
-                # Record first assignment time
-                if task.get('primeira_atribuicao', -1) == -1:
-                    task['primeira_atribuicao'] = current_time 
+                    # Record first assignment time
+                    if task.get('primeira_atribuicao', -1) == -1:
+                        task['primeira_atribuicao'] = current_time 
                 
-                status = server.get_server_status()
+                    with self.profiler.phase('status'):
+                        status = server.get_server_status()
 
-                priority_label = priority_map.get(task['prioridade'], "Desconhecida") 
+                    priority_label = priority_map.get(task['prioridade'], "Desconhecida") 
 
-                print(
-                    f"\n{cyan('[DISPATCH]')} "
-                    f"Tarefa {task['id']} -> Servidor {server.id} (Cap: {status['current_capacity']}/{status['max_capacity']})\n"
-                    f" - Tempo Execução Total: {task['tempo_exec']:.2f}s\n"
-                    f" - Chegada: {task['temp_chegada']:.2f}s\n"
-                    f" - Prioridade: {priority_label} ({task['prioridade']})\n"
-                )
-                assigned_tasks.append(task)
+                    with self.profiler.phase('print'):
+                        print(
+                            f"\n{cyan('[DISPATCH]')} "
+                            f"Tarefa {task['id']} -> Servidor {server.id} (Cap: {status['current_capacity']}/{status['max_capacity']})\n"
+                            f" - Tempo Execução Total: {task['tempo_exec']:.2f}s\n"
+                            f" - Chegada: {task['temp_chegada']:.2f}s\n"
+                            f" - Prioridade: {priority_label} ({task['prioridade']})\n"
+                        )
+                    assigned_tasks.append(task)
 
             # Prevent tight loop
-            is_server_busy = any(s.get_server_status()['current_capacity'] > 0 for s in self.servers)
+            with self.profiler.phase('status'):
+                is_server_busy = any(s.get_server_status()['current_capacity'] > 0 for s in self.servers)
             if self.pending_global_queue or self.priority_ready_queue or is_server_busy:
-                time.sleep(0.1) 
+                with self.profiler.phase('sleep'):
+                    time.sleep(0.1) 
             
             # Check exit condition
-            if not self.tasks_to_complete and all(s.get_server_status()['current_capacity'] == 0 for s in self.servers):
-                 break
+            with self.profiler.phase('status'):
+                if not self.tasks_to_complete and all(s.get_server_status()['current_capacity'] == 0 for s in self.servers):
+                     break
                     
         self.end_time = time.time()
         
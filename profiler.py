@@ -0,0 +1,207 @@
+from contextlib import nullcontext
+from threading import Lock, local
+from time import perf_counter
+
+# Histogram bucket upper bounds (seconds): 1µs, 10µs, 100µs, 1ms, 10ms, 100ms, +inf
+HISTOGRAM_BOUNDS = [1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, float('inf')]
+HISTOGRAM_LABELS = ['<=1µs', '<=10µs', '<=100µs', '<=1ms', '<=10ms', '<=100ms', '>100ms']
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(HISTOGRAM_BOUNDS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        """Add a duration sample (seconds) to the histogram"""
+
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+        for i, bound in enumerate(HISTOGRAM_BOUNDS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+
+    def format_buckets(self):
+        """Render non-empty buckets on a single line"""
+
+        parts = [f"{label}: {count}" for label, count in zip(HISTOGRAM_LABELS, self.buckets) if count]
+        return ", ".join(parts) if parts else "-"
+
+
+class InstrumentedLock:
+    def __init__(self, name, lock=None):
+
+        # Wrapped lock and identification
+        self.name = name
+        self._lock = lock if lock is not None else Lock()
+
+        # Lock statistics (guarded by a separate internal lock)
+        self._stats_lock = Lock()
+        self.wait_histogram = Histogram()
+        self.hold_histogram = Histogram()
+
+        # Only valid while held; the lock is exclusive so one slot is enough
+        self._acquired_at = 0.0
+
+    def acquire(self, blocking=True, timeout=-1):
+        """Acquire the wrapped lock, recording how long the caller waited"""
+
+        wait_start = perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        acquired_at = perf_counter()
+
+        if acquired:
+            self._acquired_at = acquired_at
+            with self._stats_lock:
+                self.wait_histogram.record(acquired_at - wait_start)
+        return acquired
+
+    def release(self):
+        """Release the wrapped lock, recording how long it was held"""
+
+        hold_time = perf_counter() - self._acquired_at
+        self._lock.release()
+
+        with self._stats_lock:
+            self.hold_histogram.record(hold_time)
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._push(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler._pop()
+
+
+class Profiler:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+
+        # Phase statistics: name -> [calls, self time]
+        self.phases = {}
+        self._phases_lock = Lock()
+        self._thread_state = local()
+
+        # Instrumented locks in registration order
+        self.locks = []
+
+        # Measurement window, stamped around the scheduler run
+        self.start_time = None
+        self.end_time = None
+
+    def mark_start(self):
+        """Open the measurement window (scheduler run begins)"""
+
+        self.start_time = perf_counter()
+
+    def mark_end(self):
+        """Close the measurement window (scheduler run and server shutdown done)"""
+
+        self.end_time = perf_counter()
+
+    def phase(self, name):
+        """Context manager timing a named phase (self time, excluding nested phases)"""
+
+        if not self.enabled:
+            return nullcontext()
+        return _Phase(self, name)
+
+    def instrument_lock(self, lock, name):
+        """Wrap a lock so acquire-wait and hold times are recorded"""
+
+        if not self.enabled:
+            return lock
+
+        instrumented = InstrumentedLock(name, lock)
+        self.locks.append(instrumented)
+        return instrumented
+
+    def _push(self, name):
+        """Open a phase frame on the calling thread's stack"""
+
+        stack = getattr(self._thread_state, 'stack', None)
+        if stack is None:
+            stack = self._thread_state.stack = []
+
+        # Frame: [name, start, time spent in nested phases]
+        stack.append([name, perf_counter(), 0.0])
+
+    def _pop(self):
+        """Close the innermost phase frame and account its self time"""
+
+        stack = self._thread_state.stack
+        name, start, child_time = stack.pop()
+        elapsed = perf_counter() - start
+
+        # Charge the elapsed time to the parent as nested time
+        if stack:
+            stack[-1][2] += elapsed
+
+        with self._phases_lock:
+            stats = self.phases.setdefault(name, [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed - child_time
+
+    def report(self):
+        """Display phase timing and lock contention summary"""
+
+        if not self.enabled:
+            return
+
+        if self.start_time is None or self.end_time is None:
+            wall_time = 0.0
+        else:
+            wall_time = self.end_time - self.start_time
+
+        print("\n" + "="*50)
+        print("Perfil do Escalonador:")
+        print(f"Tempo de execução do escalonador: {wall_time:.2f}s")
+
+        # Phase timings, most expensive first
+        print("\nFases (tempo próprio somado entre threads; % da execução pode passar de 100%):")
+        with self._phases_lock:
+            phases = sorted(self.phases.items(), key=lambda item: item[1][1], reverse=True)
+
+        for name, (calls, total) in phases:
+            avg_ms = (total / calls) * 1000 if calls else 0.0
+            share = (total / wall_time) * 100 if wall_time > 0 else 0.0
+            print(f" - {name:<24} chamadas: {calls:>7} | total: {total:8.3f}s | média: {avg_ms:8.3f}ms | {share:5.1f}%")
+
+        # Lock contention
+        print("\nLocks:")
+        for lock in self.locks:
+            with lock._stats_lock:
+                wait = lock.wait_histogram
+                hold = lock.hold_histogram
+
+                avg_wait_us = (wait.total / wait.count) * 1e6 if wait.count else 0.0
+                avg_hold_us = (hold.total / hold.count) * 1e6 if hold.count else 0.0
+
+                print(f" - {lock.name} | aquisições: {wait.count}")
+                print(f"     Espera: total {wait.total:.4f}s | média {avg_wait_us:.1f}µs | máx {wait.max * 1e6:.1f}µs")
+                print(f"       [{wait.format_buckets()}]")
+                print(f"     Posse:  total {hold.total:.4f}s | média {avg_hold_us:.1f}µs | máx {hold.max * 1e6:.1f}µs")
+                print(f"       [{hold.format_buckets()}]")
+        print("="*50)
@@ -1,6 +1,7 @@
 from multiprocessing import Process, Manager
 from threading import Thread, Lock, Event
 from colors import red, green, blue
+from profiler import Profiler
 from time import time, sleep
 
 def process_task_worker(server_id, task, result_queue, manager_start_time): 
@@ -8,7 +9,6 @@ def process_task_worker(server_id, task, result_queue, manager_start_time):
     
     task_id = task.get('id')
     execution_time_slice = task.get('tempo_restante', 0)
-    assignment_time = task.get('tempo_atribuicao')
     
     server_log_prefix = f"Servidor {server_id}"
     elapsed_time = time() - manager_start_time
@@ -19,12 +19,11 @@ def process_task_worker(server_id, task, result_queue, manager_start_time):
     sleep(execution_time_slice)
     
     completion_time = time()
-    response_time = completion_time - assignment_time
     
     # Send completion result back to server
     result_queue.put({
         'task_id': task_id,
-        'tempo_resposta': response_time,
+        'tempo_conclusao': completion_time,
     })
     
     elapsed_time = time() - manager_start_time
@@ -51,6 +50,7 @@ class Server(Thread):
         
         # Inter-process communication
         self.task_manager = task_manager
+        self.profiler = task_manager.profiler if task_manager else Profiler(enabled=False)
         self.manager = Manager() 
         self.result_queue = self.manager.Queue() 
 
@@ -111,7 +111,7 @@ class Server(Thread):
             if self.task_manager:
                 self.task_manager.register_completion(
                     result['task_id'], 
-                    result['tempo_resposta']
+                    result['tempo_conclusao']
                 )
         
         manager_start_time = self.task_manager.start_time if self.task_manager else time()
@@ -142,7 +142,8 @@ class Server(Thread):
         
         while not self.stop_event.is_set(): 
             # Check for completed tasks
-            self.check_completed_processes() 
+            with self.profiler.phase('server.check_completed'):
+                self.check_completed_processes() 
             
             # Process queued tasks if capacity available
             with self.lock: 
@@ -151,10 +152,12 @@ class Server(Thread):
                     
                     # Release lock during process creation to allow concurrent access
                     self.lock.release()
-                    self.start_task_process(task)
+                    with self.profiler.phase('server.start_process'):
+                        self.start_task_process(task)
                     self.lock.acquire()
             
-            sleep(0.05) 
+            with self.profiler.phase('server.sleep'):
+                sleep(0.05) 
         
         # Shutdown sequence
         elapsed_time = time() - manager_start_time
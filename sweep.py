@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from colors import red, cyan, green
+from master import TaskManager
+from server import Server
+
+
+def parse_values(text, cast):
+    """Parse a comma list ('1,2,4') or inclusive range ('start:stop:step')"""
+
+    try:
+        if ':' in text:
+            parts = text.split(':')
+            if len(parts) != 3:
+                print(f"Erro: intervalo deve ter o formato início:fim:passo: {text}")
+                sys.exit(1)
+            start, stop, step = (cast(part) for part in parts)
+        else:
+            return [cast(part) for part in text.split(',') if part]
+    except ValueError:
+        print(f"Erro: valor inválido: {text}")
+        sys.exit(1)
+
+    if step <= 0:
+        print(f"Erro: passo do intervalo deve ser positivo: {text}")
+        sys.exit(1)
+
+    values = []
+    value = start
+    while value <= stop + 1e-9:
+        values.append(value)
+        value += step
+    return values
+
+
+def build_configurations(policies, quanta, server_counts, capacities):
+    """Expand the sweep grid (quantum only varies for Round-Robin)"""
+
+    configurations = []
+    for policy, num_servers, capacity in itertools.product(policies, server_counts, capacities):
+        policy_quanta = quanta if policy == 'rr' else [None]
+        for quantum in policy_quanta:
+            configurations.append({
+                'policy': policy,
+                'quantum': quantum,
+                'num_servers': num_servers,
+                'capacity': capacity,
+            })
+    return configurations
+
+
+def silence_output():
+    """Pool initializer: discard scheduler and server logs of each run"""
+
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+
+def run_configuration(configuration, requests, timeout):
+    """Run one full simulation in a worker process and return its metrics"""
+
+    # Homogeneous fleet for this configuration
+    servers = []
+    for server_id in range(1, configuration['num_servers'] + 1):
+        servers.append(Server(server_id, configuration['capacity']))
+
+    quantum = configuration['quantum'] if configuration['quantum'] is not None else 1.0
+
+    task_manager = TaskManager(configuration['policy'], servers, requests, quantum=quantum)
+
+    # Daemon so a stuck run cannot keep the worker alive (each worker runs a single configuration)
+    task_manager.daemon = True
+    task_manager.start()
+    task_manager.join(timeout)
+
+    # Stop the fleet and kill in-flight slices (Server.run waits for its child processes)
+    timed_out = task_manager.is_alive()
+    if timed_out:
+        for server in servers:
+            server.stop()
+        for server in servers:
+            while server.is_alive():
+                with server.lock:
+                    for process_info in server.active_processes:
+                        process_info['process'].terminate()
+                server.join(0.1)
+
+    metrics = task_manager.calculate_metrics(0.0)
+    return {**configuration, **metrics, 'timed_out': timed_out}
+
+
+def rank_results(results, objective):
+    """Sort runs best-first; runs that completed fewer tasks rank lower"""
+
+    def rank_key(result):
+        if objective == 'p99':
+            return (-result['completed_tasks'], result['p99_response_time'])
+        return (-result['completed_tasks'], -result['throughput'])
+
+    return sorted(results, key=rank_key)
+
+
+def display_results(ranked, objective, total_tasks):
+    """Display every run and the recommended configuration"""
+
+    print("\n" + "="*50)
+    print(f"Resultados da Varredura (objetivo: {objective}):")
+
+    for result in ranked:
+        quantum = f"{result['quantum']:.2f}s" if result['quantum'] is not None else "-"
+        print(
+            f" - {result['policy']:<8} quantum: {quantum:>6} | servidores: {result['num_servers']} x cap. {result['capacity']}"
+            f" | p99: {result['p99_response_time']:.2f}s | média: {result['avg_response_time']:.2f}s"
+            f" | throughput: {result['throughput']:.2f} tarefas/s | concluídas: {result['completed_tasks']}"
+            f"{' |' + red('TEMPO ESGOTADO') if result['timed_out'] else ''}"
+        )
+
+    best = ranked[0]
+    if best['completed_tasks'] < total_tasks:
+        print("\nErro: nenhuma configuração concluiu todas as tarefas")
+        print("="*50)
+        return
+
+    print(f"\n{green('RECOMENDADO')} {best['policy']}", end="")
+    if best['quantum'] is not None:
+        print(f" (quantum {best['quantum']:.2f}s)", end="")
+    print(f", {best['num_servers']} servidores com capacidade {best['capacity']}")
+    print("="*50)
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros do escalonador")
+    parser.add_argument('--workload', default='tasks.json', help="arquivo JSON com as requisições")
+    parser.add_argument('--policies', default='rr,sjf,priority', help="ex.: rr,sjf,priority")
+    parser.add_argument('--quanta', default='1.0', help="ex.: 0.5,1,2 ou 0.5:2:0.5")
+    parser.add_argument('--servers', default='3', help="quantidade de servidores, ex.: 1,2,3")
+    parser.add_argument('--capacities', default='2', help="capacidade de cada servidor, ex.: 1:3:1")
+    parser.add_argument('--objective', choices=['p99', 'throughput'], default='p99')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processos paralelos (padrão: todos os núcleos)")
+    parser.add_argument('--timeout', type=float, default=600.0, help="tempo máximo por execução em segundos")
+    args = parser.parse_args()
+
+    policies = [policy for policy in args.policies.split(',') if policy]
+    invalid = [p for p in policies if p not in ['rr', 'sjf', 'priority']]
+    if invalid:
+        print(f"Erro: política inválida: {', '.join(invalid)}")
+        sys.exit(1)
+
+    # Load workload
+    with open(args.workload, 'r') as file:
+        data = json.load(file)
+    requests = data['requisicoes']
+    total_tasks = len({request['id'] for request in requests})
+
+    quanta = parse_values(args.quanta, float)
+    server_counts = parse_values(args.servers, int)
+    capacities = parse_values(args.capacities, int)
+
+    # Reject configurations that can never finish
+    if args.workers < 1:
+        print("Erro: quantidade de processos deve ser pelo menos 1")
+        sys.exit(1)
+    if args.timeout <= 0:
+        print("Erro: timeout deve ser maior que zero")
+        sys.exit(1)
+    if any(quantum <= 0 for quantum in quanta):
+        print("Erro: quantum deve ser maior que zero")
+        sys.exit(1)
+    if any(num_servers < 1 for num_servers in server_counts):
+        print("Erro: quantidade de servidores deve ser pelo menos 1")
+        sys.exit(1)
+    if any(capacity < 1 for capacity in capacities):
+        print("Erro: capacidade deve ser pelo menos 1")
+        sys.exit(1)
+
+    configurations = build_configurations(policies, quanta, server_counts, capacities)
+    if not configurations:
+        print("Erro: nenhuma configuração para executar (listas vazias ou intervalo invertido)")
+        sys.exit(1)
+
+    print(f"{cyan('[SWEEP]')} {len(configurations)} configurações | {args.workers} processos")
+
+    # Run every configuration concurrently
+    results = []
+    # Fresh worker per configuration, so a timed-out run's threads die with its process
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=silence_output, max_tasks_per_child=1) as executor:
+        futures = [executor.submit(run_configuration, configuration, requests, args.timeout) for configuration in configurations]
+
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"{cyan('[SWEEP]')} {len(results)}/{len(configurations)} concluídas")
+
+    display_results(rank_results(results, args.objective), args.objective, total_tasks)